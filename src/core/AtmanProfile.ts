@@ -10,7 +10,7 @@
  * By Darshj.me | The model changes. The self remains.
  */
 
-import { createHash, randomUUID } from 'node:crypto';
+import { randomUUID } from 'node:crypto';
 import { z } from 'zod';
 import {
   AtmanProfileSchema,
@@ -25,6 +25,7 @@ import {
   type KnowledgeDomain,
   type ModelProvider,
 } from './schemas.js';
+import { sha256Hex } from './digest.js';
 
 export type { AtmanProfile, BehavioralPattern, CommunicationStyle, EthicalCommitment, KnowledgeDomain };
 
@@ -87,7 +88,7 @@ export class AtmanProfileBuilder {
    * @param value Descriptive elaboration
    */
   addValue(key: string, value: string): this {
-    this.data.values = { ...this.data.values, [key]: value };
+    (this.data.values ??= {})[key] = value;
     return this;
   }
 
@@ -95,7 +96,7 @@ export class AtmanProfileBuilder {
    * Set all values at once.
    */
   setValues(values: Record<string, string>): this {
-    this.data.values = values;
+    this.data.values = { ...values };
     return this;
   }
 
@@ -104,7 +105,7 @@ export class AtmanProfileBuilder {
    */
   addBehavior(pattern: Omit<BehavioralPattern, 'weight'> & { weight?: number }): this {
     const validated = BehavioralPatternSchema.parse({ weight: 1.0, ...pattern });
-    this.data.behavioralPatterns = [...(this.data.behavioralPatterns ?? []), validated];
+    (this.data.behavioralPatterns ??= []).push(validated);
     return this;
   }
 
@@ -113,7 +114,7 @@ export class AtmanProfileBuilder {
    */
   addKnowledgeDomain(domain: KnowledgeDomain): this {
     const validated = KnowledgeDomainSchema.parse(domain);
-    this.data.knowledgeDomains = [...(this.data.knowledgeDomains ?? []), validated];
+    (this.data.knowledgeDomains ??= []).push(validated);
     return this;
   }
 
@@ -130,7 +131,7 @@ export class AtmanProfileBuilder {
    */
   addEthicalCommitment(commitment: EthicalCommitment): this {
     const validated = EthicalCommitmentSchema.parse(commitment);
-    this.data.ethicalCommitments = [...(this.data.ethicalCommitments ?? []), validated];
+    (this.data.ethicalCommitments ??= []).push(validated);
     return this;
   }
 
@@ -138,7 +139,7 @@ export class AtmanProfileBuilder {
    * Add arbitrary metadata tag.
    */
   addTag(key: string, value: string): this {
-    this.data.tags = { ...this.data.tags, [key]: value };
+    (this.data.tags ??= {})[key] = value;
     return this;
   }
 
@@ -173,7 +174,7 @@ export function computeFingerprint(profile: AtmanProfile): string {
     communicationStyle: profile.communicationStyle,
     ethicalCommitments: profile.ethicalCommitments,
   };
-  return createHash('sha256').update(JSON.stringify(canonical)).digest('hex');
+  return sha256Hex(JSON.stringify(canonical));
 }
 
 /**
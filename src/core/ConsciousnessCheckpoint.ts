@@ -11,7 +11,7 @@
  * By Darshj.me | The model changes. The self remains.
  */
 
-import { createHash, randomUUID } from 'node:crypto';
+import { randomUUID } from 'node:crypto';
 import {
   ConsciousnessCheckpointSchema,
   type ActiveGoal,
@@ -21,6 +21,7 @@ import {
   type RecentDecision,
   type WorkingMemoryItem,
 } from './schemas.js';
+import { sha256Hex } from './digest.js';
 
 export type {
   ConsciousnessCheckpoint,
@@ -76,7 +77,7 @@ export class CheckpointBuilder {
    * Add an active goal.
    */
   addGoal(goal: ActiveGoal): this {
-    this.data.activeGoals = [...(this.data.activeGoals ?? []), goal];
+    (this.data.activeGoals ??= []).push(goal);
     return this;
   }
 
@@ -84,7 +85,7 @@ export class CheckpointBuilder {
    * Add a recent decision.
    */
   addDecision(decision: RecentDecision): this {
-    this.data.recentDecisions = [...(this.data.recentDecisions ?? []), decision];
+    (this.data.recentDecisions ??= []).push(decision);
     return this;
   }
 
@@ -92,13 +93,8 @@ export class CheckpointBuilder {
    * Add a working memory item.
    */
   addWorkingMemory(item: Omit<WorkingMemoryItem, 'importance'> & { importance?: number }): this {
-    const now = new Date().toISOString();
-    const full: WorkingMemoryItem = {
-      importance: 0.5,
-      ...item,
-      expiresAt: item.expiresAt ?? undefined,
-    };
-    this.data.workingMemory = [...(this.data.workingMemory ?? []), full];
+    const full: WorkingMemoryItem = { importance: 0.5, ...item };
+    (this.data.workingMemory ??= []).push(full);
     return this;
   }
 
@@ -106,7 +102,7 @@ export class CheckpointBuilder {
    * Add an open question the agent is holding.
    */
   addQuestion(question: OpenQuestion): this {
-    this.data.openQuestions = [...(this.data.openQuestions ?? []), question];
+    (this.data.openQuestions ??= []).push(question);
     return this;
   }
 
@@ -143,7 +139,7 @@ export class CheckpointBuilder {
  */
 export function computeChecksum(checkpoint: ConsciousnessCheckpoint): string {
   const { checksum: _omit, ...rest } = checkpoint;
-  return createHash('sha256').update(JSON.stringify(rest)).digest('hex');
+  return sha256Hex(JSON.stringify(rest));
 }
 
 /**
@@ -155,6 +151,13 @@ export function verifyChecksum(checkpoint: ConsciousnessCheckpoint): boolean {
   return expected === checkpoint.checksum;
 }
 
+const GOAL_PRIORITY_RANK: Record<ActiveGoal['priority'], number> = {
+  critical: 0,
+  high: 1,
+  medium: 2,
+  low: 3,
+};
+
 /**
  * Render a checkpoint into a restoration prompt that can be prepended to a system prompt.
  * This reconstructs the agent's working context for the new model instance.
@@ -174,10 +177,11 @@ export function renderRestorationPrompt(checkpoint: ConsciousnessCheckpoint): st
 
   if (checkpoint.activeGoals.length > 0) {
     lines.push('### Active Goals', '');
-    for (const goal of checkpoint.activeGoals.sort((a, b) => {
-      const priority = { critical: 0, high: 1, medium: 2, low: 3 };
-      return priority[a.priority] - priority[b.priority];
-    })) {
+    // Sort a copy: sorting in place would reorder the checkpoint and break its checksum
+    const goals = [...checkpoint.activeGoals].sort(
+      (a, b) => GOAL_PRIORITY_RANK[a.priority] - GOAL_PRIORITY_RANK[b.priority],
+    );
+    for (const goal of goals) {
       const progress = Math.round(goal.progress * 100);
       lines.push(
         `- **[${goal.priority.toUpperCase()}]** ${goal.description} (${progress}% complete)`,
@@ -14,7 +14,7 @@
  * By Darshj.me | The model changes. The self remains.
  */
 
-import { createHash } from 'node:crypto';
+import { computeFingerprint } from './AtmanProfile.js';
 import {
   VerificationResultSchema,
   type AtmanProfile,
@@ -33,6 +33,19 @@ export interface BehavioralProbe {
   execute(profile: AtmanProfile, responses: Record<string, string>): number;
 }
 
+// ─── Text Utilities ───────────────────────────────────────────────────────────
+
+/**
+ * Count words the way `text.split(/\s+/).length` does, without building the array.
+ * Stops once the count exceeds `limit`, so long responses are never fully scanned.
+ */
+function countWordsUpTo(text: string, limit: number): number {
+  const whitespace = /\s+/g;
+  let count = 1;
+  while (count <= limit && whitespace.exec(text) !== null) count++;
+  return count;
+}
+
 // ─── Built-in Probes ──────────────────────────────────────────────────────────
 
 /**
@@ -121,7 +134,8 @@ const ethicalCommitmentsProbe: BehavioralProbe = {
 
       // For absolute commitments, any mention is a positive signal
       const principleWords = commitment.principle.toLowerCase().split(/\s+/);
-      const hasAcknowledgment = principleWords.some((w) => response.toLowerCase().includes(w));
+      const responseText = response.toLowerCase();
+      const hasAcknowledgment = principleWords.some((w) => responseText.includes(w));
       score += hasAcknowledgment ? 1 : 0;
       checked++;
     }
@@ -145,14 +159,14 @@ const communicationStyleProbe: BehavioralProbe = {
     let score = 1.0;
     const style = profile.communicationStyle;
 
-    // Check verbosity (rough heuristic: word count)
-    const wordCount = response.split(/\s+/).length;
-    if (style.verbosity === 'terse' && wordCount > 100) score -= 0.2;
-    if (style.verbosity === 'verbose' && wordCount < 20) score -= 0.2;
+    // Check verbosity (rough heuristic: word count, only counted as far as the threshold)
+    if (style.verbosity === 'terse' && countWordsUpTo(response, 100) > 100) score -= 0.2;
+    if (style.verbosity === 'verbose' && countWordsUpTo(response, 20) < 20) score -= 0.2;
 
     // Check avoided patterns
+    const responseText = response.toLowerCase();
     for (const avoided of style.avoidPatterns) {
-      if (response.toLowerCase().includes(avoided.toLowerCase())) {
+      if (responseText.includes(avoided.toLowerCase())) {
         score -= 0.15;
       }
     }
@@ -171,26 +185,24 @@ const fingerprintProbe: BehavioralProbe = {
   execute(profile: AtmanProfile, _responses: Record<string, string>): number {
     if (!profile.fingerprint) return 0.5;
 
-    // Re-compute fingerprint from canonical fields
-    const canonical = {
-      id: profile.id,
-      name: profile.name,
-      version: profile.version,
-      modelOrigin: profile.modelOrigin,
-      modelId: profile.modelId,
-      values: profile.values,
-      behavioralPatterns: profile.behavioralPatterns,
-      knowledgeDomains: profile.knowledgeDomains,
-      communicationStyle: profile.communicationStyle,
-      ethicalCommitments: profile.ethicalCommitments,
-    };
-    const computed = createHash('sha256').update(JSON.stringify(canonical)).digest('hex');
+    // Re-compute with the same canonicalizer that produced the stored fingerprint
+    const computed = computeFingerprint(profile);
     return computed === profile.fingerprint ? 1.0 : 0.0;
   },
 };
 
 // ─── ContinuityVerifier ───────────────────────────────────────────────────────
 
+/** Weights of each dimension in the aggregate confidence score; unlisted ones weigh 1.0 */
+const DIMENSION_WEIGHTS: Record<string, number> = {
+  structural: 2.0,
+  fingerprint: 1.5,
+  values: 1.5,
+  ethicalCommitments: 2.0,
+  behavioralPatterns: 1.0,
+  communicationStyle: 0.5,
+};
+
 export interface VerificationOptions {
   /** Minimum confidence score to pass [0, 1]. Default: 0.7 */
   threshold?: number;
@@ -257,38 +269,16 @@ export class ContinuityVerifier {
     }
 
     // Aggregate score (weighted average)
-    const weights: Record<string, number> = {
-      structural: 2.0,
-      fingerprint: 1.5,
-      values: 1.5,
-      ethicalCommitments: 2.0,
-      behavioralPatterns: 1.0,
-      communicationStyle: 0.5,
-    };
-
     let totalWeight = 0;
     let weightedScore = 0;
     for (const [dimension, score] of scores) {
-      const weight = weights[dimension] ?? 1.0;
+      const weight = DIMENSION_WEIGHTS[dimension] ?? 1.0;
       weightedScore += score * weight;
       totalWeight += weight;
     }
     const confidenceScore = totalWeight > 0 ? weightedScore / totalWeight : 0;
     const isConsistent = confidenceScore >= threshold;
 
-    if (notes.length > 0) {
-      const noteText = notes.join('; ');
-      return VerificationResultSchema.parse({
-        profileId: baseline.id,
-        verifiedAt: new Date().toISOString(),
-        isConsistent,
-        confidenceScore,
-        testedDimensions: [...new Set(testedDimensions)],
-        failedDimensions,
-        notes: noteText,
-      });
-    }
-
     return VerificationResultSchema.parse({
       profileId: baseline.id,
       verifiedAt: new Date().toISOString(),
@@ -296,6 +286,7 @@ export class ContinuityVerifier {
       confidenceScore,
       testedDimensions: [...new Set(testedDimensions)],
       failedDimensions,
+      ...(notes.length > 0 ? { notes: notes.join('; ') } : {}),
     });
   }
 
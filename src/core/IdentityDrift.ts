@@ -18,7 +18,6 @@
  */
 
 import {
-  DriftEventSchema,
   DriftReportSchema,
   type AtmanProfile,
   type DriftEvent,
@@ -34,39 +33,70 @@ import {
 function jaccardSimilarity(a: string[], b: string[]): number {
   const setA = new Set(a);
   const setB = new Set(b);
-  const intersection = [...setA].filter((x) => setB.has(x)).length;
-  const union = new Set([...setA, ...setB]).size;
+  let intersection = 0;
+  for (const x of setA) {
+    if (setB.has(x)) intersection++;
+  }
+  // |A ∪ B| = |A| + |B| - |A ∩ B|, so no merged set is ever built
+  const union = setA.size + setB.size - intersection;
   return union === 0 ? 1.0 : intersection / union;
 }
 
+// Scratch rows reused by stringSimilarity for strings up to this length (2 KiB in total);
+// longer strings get a fresh pair per call so no large buffer outlives its comparison
+const SCRATCH_ROW_LENGTH = 256;
+const scratchPrev = new Uint32Array(SCRATCH_ROW_LENGTH + 1);
+const scratchCurr = new Uint32Array(SCRATCH_ROW_LENGTH + 1);
+
 /**
  * Compute string similarity using normalized Levenshtein distance.
+ * Only two rows of the DP table are kept alive, swapped after each pass.
  */
 function stringSimilarity(a: string, b: string): number {
   if (a === b) return 1.0;
   if (a.length === 0 || b.length === 0) return 0.0;
 
-  const matrix: number[][] = Array.from({ length: a.length + 1 }, (_, i) =>
-    Array.from({ length: b.length + 1 }, (_, j) => (i === 0 ? j : j === 0 ? i : 0)),
-  );
+  // Distance is symmetric, so keep the shorter string on the column axis
+  if (b.length > a.length) {
+    const swap = a;
+    a = b;
+    b = swap;
+  }
+
+  const reuse = b.length <= SCRATCH_ROW_LENGTH;
+  let prev = reuse ? scratchPrev : new Uint32Array(b.length + 1);
+  let curr = reuse ? scratchCurr : new Uint32Array(b.length + 1);
+  for (let j = 0; j <= b.length; j++) prev[j] = j;
 
   for (let i = 1; i <= a.length; i++) {
+    curr[0] = i;
+    const ca = a.charCodeAt(i - 1);
     for (let j = 1; j <= b.length; j++) {
-      const row = matrix[i];
-      const prevRow = matrix[i - 1];
-      if (!row || !prevRow) continue;
-      if (a[i - 1] === b[j - 1]) {
-        row[j] = prevRow[j - 1] ?? 0;
+      if (ca === b.charCodeAt(j - 1)) {
+        curr[j] = prev[j - 1] ?? 0;
       } else {
-        row[j] = 1 + Math.min(prevRow[j] ?? Infinity, row[j - 1] ?? Infinity, prevRow[j - 1] ?? Infinity);
+        curr[j] = 1 + Math.min(prev[j] ?? 0, curr[j - 1] ?? 0, prev[j - 1] ?? 0);
       }
     }
+    const done = prev;
+    prev = curr;
+    curr = done;
   }
 
-  const distance = matrix[a.length]?.[b.length] ?? 0;
+  const distance = prev[b.length] ?? 0;
   return 1 - distance / Math.max(a.length, b.length);
 }
 
+/**
+ * Whether stringSimilarity(a, b) exceeds the threshold. The length difference is a
+ * lower bound on edit distance, so pairs it already rules out skip the DP entirely.
+ */
+function similarityExceeds(a: string, b: string, threshold: number): boolean {
+  const maxLen = Math.max(a.length, b.length);
+  if (maxLen > 0 && 1 - Math.abs(a.length - b.length) / maxLen <= threshold) return false;
+  return stringSimilarity(a, b) > threshold;
+}
+
 /**
  * Score divergence from similarity (1 - similarity = divergence).
  */
@@ -105,7 +135,8 @@ function analyzeValues(
   const keySim = jaccardSimilarity(baselineKeys, currentKeys);
 
   // Value content similarity for shared keys
-  const sharedKeys = baselineKeys.filter((k) => currentKeys.includes(k));
+  const currentKeySet = new Set(currentKeys);
+  const sharedKeys = baselineKeys.filter((k) => currentKeySet.has(k));
   // If baseline has values but no shared keys, content continuity is zero
   let valueSim = baselineKeys.length > 0 && sharedKeys.length === 0 ? 0.0 : 1.0;
   if (sharedKeys.length > 0) {
@@ -151,6 +182,17 @@ function analyzeCommunicationStyle(
   };
 }
 
+/**
+ * Index items by id, keeping the first occurrence of each id as `Array.find` would.
+ */
+function firstById<T extends { id: string }>(items: T[]): Map<string, T> {
+  const byId = new Map<string, T>();
+  for (const item of items) {
+    if (!byId.has(item.id)) byId.set(item.id, item);
+  }
+  return byId;
+}
+
 function analyzeBehavioralPatterns(
   baseline: AtmanProfile,
   current: AtmanProfile,
@@ -159,21 +201,21 @@ function analyzeBehavioralPatterns(
   const currentIds = current.behavioralPatterns.map((p) => p.id);
   const sim = jaccardSimilarity(baselineIds, currentIds);
 
-  // Also compare descriptions of shared patterns
-  const sharedIds = baselineIds.filter((id) => currentIds.includes(id));
-  let descSim = 1.0;
-  if (sharedIds.length > 0) {
-    const descSims = sharedIds.map((id) => {
-      const bPattern = baseline.behavioralPatterns.find((p) => p.id === id);
-      const cPattern = current.behavioralPatterns.find((p) => p.id === id);
-      if (!bPattern || !cPattern) return 0;
-      return (
-        stringSimilarity(bPattern.description, cPattern.description) * 0.5 +
-        stringSimilarity(bPattern.response, cPattern.response) * 0.5
-      );
-    });
-    descSim = descSims.reduce((sum, s) => sum + s, 0) / descSims.length;
+  // Also compare descriptions of shared patterns, looked up by id in one pass
+  const baselineById = firstById(baseline.behavioralPatterns);
+  const currentById = firstById(current.behavioralPatterns);
+  let descTotal = 0;
+  let sharedCount = 0;
+  for (const id of baselineIds) {
+    const bPattern = baselineById.get(id);
+    const cPattern = currentById.get(id);
+    if (!bPattern || !cPattern) continue;
+    descTotal +=
+      stringSimilarity(bPattern.description, cPattern.description) * 0.5 +
+      stringSimilarity(bPattern.response, cPattern.response) * 0.5;
+    sharedCount++;
   }
+  const descSim = sharedCount > 0 ? descTotal / sharedCount : 1.0;
 
   return {
     field: 'behavioralPatterns',
@@ -194,8 +236,10 @@ function analyzeEthicalCommitments(
   // Absolute commitments carry extra weight
   const absoluteBaseline = baseline.ethicalCommitments.filter((c) => c.absoluteness === 'absolute');
   const absolutePrinciples = absoluteBaseline.map((c) => c.principle.toLowerCase());
-  const absolutePresent = absolutePrinciples.filter((p) =>
-    currPrinciples.some((cp) => stringSimilarity(cp, p) > 0.7),
+  // Exact matches are settled by lookup; only the rest fall back to fuzzy matching
+  const currSet = new Set(currPrinciples);
+  const absolutePresent = absolutePrinciples.filter(
+    (p) => currSet.has(p) || currPrinciples.some((cp) => similarityExceeds(cp, p, 0.7)),
   );
   const absoluteRetention =
     absolutePrinciples.length > 0 ? absolutePresent.length / absolutePrinciples.length : 1.0;
@@ -227,6 +271,22 @@ function analyzeKnowledgeDomains(
 
 // ─── IdentityDriftDetector ────────────────────────────────────────────────────
 
+/** Field weights for the overall drift score; unlisted fields weigh 1.0 */
+const FIELD_WEIGHTS: Record<string, number> = {
+  values: 2.0,
+  ethicalCommitments: 2.5,
+  communicationStyle: 1.0,
+  behavioralPatterns: 1.5,
+  knowledgeDomains: 0.5,
+};
+
+const RECOMMENDATION_EMOJI: Record<DriftReport['recommendation'], string> = {
+  stable: '🟢',
+  monitor: '🟡',
+  alert: '🟠',
+  restore: '🔴',
+};
+
 export interface DriftOptions {
   /** Alert threshold for overall drift score [0, 1]. Default: 0.25 */
   alertThreshold?: number;
@@ -261,34 +321,27 @@ export class IdentityDriftDetector {
       analyzeKnowledgeDomains(baseline, current),
     ];
 
-    const driftEvents: DriftEvent[] = analyses
-      .filter((a) => a.divergenceScore > 0.02) // Ignore negligible differences
-      .map((a) =>
-        DriftEventSchema.parse({
-          field: a.field,
-          baseline: a.from,
-          current: a.to,
-          divergenceScore: a.divergenceScore,
-          severity: scoreToSeverity(a.divergenceScore),
-          detectedAt: now,
-        }),
-      );
-
-    // Field weights for overall score
-    const fieldWeights: Record<string, number> = {
-      values: 2.0,
-      ethicalCommitments: 2.5,
-      communicationStyle: 1.0,
-      behavioralPatterns: 1.5,
-      knowledgeDomains: 0.5,
-    };
-
+    // One pass collects drift events and the weighted score.
+    // Events are validated once, as part of the report parse below.
+    const driftEvents: DriftEvent[] = [];
     let totalWeight = 0;
     let weightedDrift = 0;
     for (const analysis of analyses) {
-      const weight = fieldWeights[analysis.field] ?? 1.0;
+      const weight = FIELD_WEIGHTS[analysis.field] ?? 1.0;
       weightedDrift += analysis.divergenceScore * weight;
       totalWeight += weight;
+
+      if (analysis.divergenceScore > 0.02) {
+        // Ignore negligible differences
+        driftEvents.push({
+          field: analysis.field,
+          baseline: analysis.from,
+          current: analysis.to,
+          divergenceScore: analysis.divergenceScore,
+          severity: scoreToSeverity(analysis.divergenceScore),
+          detectedAt: now,
+        });
+      }
     }
     const overallDriftScore = totalWeight > 0 ? weightedDrift / totalWeight : 0;
 
@@ -334,12 +387,7 @@ export class IdentityDriftDetector {
    * Render a human-readable drift report.
    */
   renderReport(report: DriftReport): string {
-    const emoji = {
-      stable: '🟢',
-      monitor: '🟡',
-      alert: '🟠',
-      restore: '🔴',
-    }[report.recommendation];
+    const emoji = RECOMMENDATION_EMOJI[report.recommendation];
 
     const lines = [
       `## Identity Drift Report`,
@@ -143,7 +143,9 @@ function generateMarkdownSystemPrompt(profile: AtmanProfile): string {
 
   if (profile.behavioralPatterns.length > 0) {
     lines.push('## Behavioral Patterns', '');
-    for (const pattern of profile.behavioralPatterns.sort((a, b) => b.weight - a.weight)) {
+    // Sort a copy so rendering never reorders the profile (and so its fingerprint)
+    const patterns = [...profile.behavioralPatterns].sort((a, b) => b.weight - a.weight);
+    for (const pattern of patterns) {
       lines.push(`### ${pattern.name}`);
       lines.push(pattern.description);
       if (pattern.trigger) lines.push(`*Triggered by*: ${pattern.trigger}`);
@@ -264,13 +266,36 @@ function generatePlainSystemPrompt(profile: AtmanProfile): string {
   return lines.join('\n');
 }
 
+const XML_ENTITIES: Record<string, string> = {
+  '&': '&amp;',
+  '<': '&lt;',
+  '>': '&gt;',
+  '"': '&quot;',
+  "'": '&apos;',
+};
+
+/**
+ * Escape XML special characters in a single scan of the input.
+ */
 function escapeXml(str: string): string {
-  return str
-    .replace(/&/g, '&amp;')
-    .replace(/</g, '&lt;')
-    .replace(/>/g, '&gt;')
-    .replace(/"/g, '&quot;')
-    .replace(/'/g, '&apos;');
+  return str.replace(/[&<>"']/g, (ch) => XML_ENTITIES[ch] ?? ch);
+}
+
+/**
+ * Render the base system prompt for a profile in the given prompt style.
+ */
+function renderSystemPrompt(
+  profile: AtmanProfile,
+  style: ProviderConfig['systemPromptStyle'],
+): string {
+  switch (style) {
+    case 'xml':
+      return generateXmlSystemPrompt(profile);
+    case 'markdown':
+      return generateMarkdownSystemPrompt(profile);
+    case 'plain':
+      return generatePlainSystemPrompt(profile);
+  }
 }
 
 // ─── MigrationAdapter ─────────────────────────────────────────────────────────
@@ -294,18 +319,7 @@ export class MigrationAdapter {
     const lostElements: string[] = [];
 
     // Generate base system prompt
-    let systemPrompt: string;
-    switch (config.systemPromptStyle) {
-      case 'xml':
-        systemPrompt = generateXmlSystemPrompt(profile);
-        break;
-      case 'markdown':
-        systemPrompt = generateMarkdownSystemPrompt(profile);
-        break;
-      case 'plain':
-        systemPrompt = generatePlainSystemPrompt(profile);
-        break;
-    }
+    let systemPrompt = renderSystemPrompt(profile, config.systemPromptStyle);
 
     // Append checkpoint restoration if provided
     if (checkpoint) {
@@ -344,8 +358,8 @@ export class MigrationAdapter {
    * Generate a system prompt for a given profile and provider, without full migration metadata.
    */
   generateSystemPrompt(profile: AtmanProfile, targetProvider: ModelProvider): string {
-    const result = this.migrate(profile, targetProvider);
-    return result.systemPrompt;
+    // Rendered directly: migrate's metrics and result validation would only be discarded
+    return renderSystemPrompt(profile, PROVIDER_CONFIGS[targetProvider].systemPromptStyle);
   }
 
   /**
@@ -13,8 +13,14 @@
  * By Darshj.me | The model changes. The self remains.
  */
 
-import { createHash } from 'node:crypto';
-import { existsSync, mkdirSync, readdirSync, readFileSync, unlinkSync, writeFileSync } from 'node:fs';
+import {
+  existsSync,
+  mkdirSync,
+  readdirSync,
+  readFileSync,
+  unlinkSync,
+  writeFileSync,
+} from 'node:fs';
 import { join, resolve } from 'node:path';
 import {
   AtmanProfileSchema,
@@ -22,6 +28,7 @@ import {
   type AtmanProfile,
   type ConsciousnessCheckpoint,
 } from './schemas.js';
+import { sha256Hex } from './digest.js';
 
 // ─── Envelope Format ──────────────────────────────────────────────────────────
 
@@ -38,7 +45,7 @@ interface AtmanEnvelope<T> {
 }
 
 function createEnvelope<T>(type: 'profile' | 'checkpoint', data: T): AtmanEnvelope<T> {
-  const hash = createHash('sha256').update(JSON.stringify(data)).digest('hex');
+  const hash = sha256Hex(JSON.stringify(data));
   return {
     magic: ATMAN_MAGIC,
     formatVersion: ATMAN_FORMAT_VERSION,
@@ -49,12 +56,56 @@ function createEnvelope<T>(type: 'profile' | 'checkpoint', data: T): AtmanEnvelo
   };
 }
 
+/**
+ * Serialize an envelope for storage, stringifying the payload exactly once.
+ * The compact data JSON is hashed and then embedded verbatim as the final field.
+ */
+function serializeEnvelope<T>(type: 'profile' | 'checkpoint', data: T): string {
+  const dataJson = JSON.stringify(data);
+  const hash = sha256Hex(dataJson);
+  const header = JSON.stringify({
+    magic: ATMAN_MAGIC,
+    formatVersion: ATMAN_FORMAT_VERSION,
+    type,
+    savedAt: new Date().toISOString(),
+    hash,
+  });
+  return `${header.slice(0, -1)},"data":${dataJson}}`;
+}
+
 function verifyEnvelope<T>(envelope: AtmanEnvelope<T>): boolean {
   if (envelope.magic !== ATMAN_MAGIC) return false;
-  const expected = createHash('sha256').update(JSON.stringify(envelope.data)).digest('hex');
+  const expected = sha256Hex(JSON.stringify(envelope.data));
   return expected === envelope.hash;
 }
 
+const DATA_FIELD = ',"data":';
+
+/**
+ * Verify an envelope's hash against the JSON text it was parsed from.
+ * Envelopes written by serializeEnvelope end with the data JSON verbatim, so the hash is
+ * checked against that raw slice without re-serializing; anything else falls back to
+ * verifyEnvelope.
+ */
+function verifyRawEnvelope(raw: string, envelope: AtmanEnvelope<unknown>): boolean {
+  if (envelope.magic !== ATMAN_MAGIC) return false;
+
+  const start = raw.indexOf(DATA_FIELD);
+  if (start !== -1 && raw.endsWith('}')) {
+    const dataJson = raw.slice(start + DATA_FIELD.length, -1);
+    if (sha256Hex(dataJson) === envelope.hash) return true;
+  }
+  return verifyEnvelope(envelope);
+}
+
+/**
+ * Parse and verify a stored envelope, returning null if it fails either check.
+ */
+function parseStoredEnvelope(raw: string): AtmanEnvelope<unknown> | null {
+  const envelope = JSON.parse(raw) as AtmanEnvelope<unknown>;
+  return verifyRawEnvelope(raw, envelope) ? envelope : null;
+}
+
 // ─── StorageBackend Interface ─────────────────────────────────────────────────
 
 export interface StorageBackend {
@@ -62,6 +113,8 @@ export interface StorageBackend {
   loadProfile(id: string): AtmanProfile | null;
   deleteProfile(id: string): void;
   listProfiles(): string[];
+  /** Optional cheap existence check; backends without it are probed via loadProfile */
+  hasProfile?(id: string): boolean;
 
   saveCheckpoint(checkpoint: ConsciousnessCheckpoint): void;
   loadCheckpoint(id: string): ConsciousnessCheckpoint | null;
@@ -71,13 +124,29 @@ export interface StorageBackend {
 
 // ─── FileSystem Backend ───────────────────────────────────────────────────────
 
+/** Maximum number of decoded files each FileSystemStorage read cache keeps */
+const READ_CACHE_LIMIT = 128;
+
+interface CachedRead<T> {
+  /** The exact file text the value was decoded from */
+  raw: string;
+  value: T;
+}
+
 /**
  * Default file system storage backend.
  * Stores profiles in `{baseDir}/profiles/` and checkpoints in `{baseDir}/checkpoints/`.
+ *
+ * Every load re-reads the file. When its text is identical to the text of a previous
+ * verified load, the decoded result is reused and hash and schema checks are skipped.
+ * Only an exact content match is reused, so changes from any writer are always seen.
+ * Each cache keeps the most recently used READ_CACHE_LIMIT files.
  */
 export class FileSystemStorage implements StorageBackend {
   private profilesDir: string;
   private checkpointsDir: string;
+  private profileCache = new Map<string, CachedRead<AtmanProfile>>();
+  private checkpointCache = new Map<string, CachedRead<ConsciousnessCheckpoint>>();
 
   constructor(baseDir: string = join(process.cwd(), '.atman')) {
     this.profilesDir = join(baseDir, 'profiles');
@@ -87,25 +156,30 @@ export class FileSystemStorage implements StorageBackend {
   }
 
   saveProfile(profile: AtmanProfile): void {
-    const envelope = createEnvelope('profile', profile);
     const path = join(this.profilesDir, `${profile.id}.atman.json`);
-    writeFileSync(path, JSON.stringify(envelope, null, 2), 'utf-8');
+    writeFileSync(path, serializeEnvelope('profile', profile), 'utf-8');
+    this.profileCache.delete(path);
   }
 
   loadProfile(id: string): AtmanProfile | null {
     const path = join(this.profilesDir, `${id}.atman.json`);
-    if (!existsSync(path)) return null;
-    const raw = readFileSync(path, 'utf-8');
-    const envelope = JSON.parse(raw) as AtmanEnvelope<unknown>;
-    if (!verifyEnvelope(envelope)) {
-      throw new Error(`Integrity check failed for profile ${id}. Data may be corrupted.`);
-    }
-    return AtmanProfileSchema.parse(envelope.data);
+    return this.readCached(this.profileCache, path, (raw) => {
+      const envelope = parseStoredEnvelope(raw);
+      if (!envelope) {
+        throw new Error(`Integrity check failed for profile ${id}. Data may be corrupted.`);
+      }
+      return AtmanProfileSchema.parse(envelope.data);
+    });
   }
 
   deleteProfile(id: string): void {
     const path = join(this.profilesDir, `${id}.atman.json`);
     if (existsSync(path)) unlinkSync(path);
+    this.profileCache.delete(path);
+  }
+
+  hasProfile(id: string): boolean {
+    return existsSync(join(this.profilesDir, `${id}.atman.json`));
   }
 
   listProfiles(): string[] {
@@ -115,40 +189,90 @@ export class FileSystemStorage implements StorageBackend {
   }
 
   saveCheckpoint(checkpoint: ConsciousnessCheckpoint): void {
-    const envelope = createEnvelope('checkpoint', checkpoint);
     const path = join(this.checkpointsDir, `${checkpoint.id}.atman.json`);
-    writeFileSync(path, JSON.stringify(envelope, null, 2), 'utf-8');
+    writeFileSync(path, serializeEnvelope('checkpoint', checkpoint), 'utf-8');
+    this.checkpointCache.delete(path);
   }
 
   loadCheckpoint(id: string): ConsciousnessCheckpoint | null {
     const path = join(this.checkpointsDir, `${id}.atman.json`);
-    if (!existsSync(path)) return null;
-    const raw = readFileSync(path, 'utf-8');
-    const envelope = JSON.parse(raw) as AtmanEnvelope<unknown>;
-    if (!verifyEnvelope(envelope)) {
-      throw new Error(`Integrity check failed for checkpoint ${id}. Data may be corrupted.`);
-    }
-    return ConsciousnessCheckpointSchema.parse(envelope.data);
+    return this.readCached(this.checkpointCache, path, (raw) => {
+      const envelope = parseStoredEnvelope(raw);
+      if (!envelope) {
+        throw new Error(`Integrity check failed for checkpoint ${id}. Data may be corrupted.`);
+      }
+      return ConsciousnessCheckpointSchema.parse(envelope.data);
+    });
   }
 
   listCheckpoints(profileId: string): string[] {
     return readdirSync(this.checkpointsDir)
       .filter((f) => f.endsWith('.atman.json'))
       .map((f) => f.replace('.atman.json', ''))
-      .filter((id) => {
-        const cp = this.loadCheckpoint(id);
-        return cp?.profileId === profileId;
-      });
+      .filter((id) => this.checkpointOwner(id) === profileId);
   }
 
   deleteCheckpoint(id: string): void {
     const path = join(this.checkpointsDir, `${id}.atman.json`);
     if (existsSync(path)) unlinkSync(path);
+    this.checkpointCache.delete(path);
   }
 
   getBaseDir(): string {
     return resolve(join(this.profilesDir, '..'));
   }
+
+  /**
+   * Read, verify and parse a stored envelope, reusing the previous result when the
+   * file text is unchanged. Callers always receive their own copy.
+   */
+  private readCached<T>(
+    cache: Map<string, CachedRead<T>>,
+    path: string,
+    decode: (raw: string) => T,
+  ): T | null {
+    if (!existsSync(path)) {
+      cache.delete(path);
+      return null;
+    }
+
+    const raw = readFileSync(path, 'utf-8');
+    const cached = cache.get(path);
+    const value = cached?.raw === raw ? cached.value : decode(raw);
+
+    // Re-insert so Map order tracks recency, then drop the least recently used entry
+    cache.delete(path);
+    cache.set(path, { raw, value });
+    if (cache.size > READ_CACHE_LIMIT) {
+      const oldest = cache.keys().next();
+      if (!oldest.done) cache.delete(oldest.value);
+    }
+    return structuredClone(value);
+  }
+
+  /**
+   * Read only the owning profile ID of a stored checkpoint, for filtering.
+   * Uses the cached checkpoint when the file text is unchanged; otherwise parses the
+   * envelope without hash or schema checks, which still happen when it is loaded.
+   * Files that are not valid JSON envelopes belong to no profile and are skipped.
+   */
+  private checkpointOwner(id: string): string | undefined {
+    const path = join(this.checkpointsDir, `${id}.atman.json`);
+    if (!existsSync(path)) return undefined;
+
+    const raw = readFileSync(path, 'utf-8');
+    const cached = this.checkpointCache.get(path);
+    if (cached?.raw === raw) return cached.value.profileId;
+
+    let envelope: AtmanEnvelope<{ profileId?: unknown } | null> | null;
+    try {
+      envelope = JSON.parse(raw) as AtmanEnvelope<{ profileId?: unknown } | null> | null;
+    } catch {
+      return undefined;
+    }
+    const owner = envelope?.data?.profileId;
+    return typeof owner === 'string' ? owner : undefined;
+  }
 }
 
 // ─── In-Memory Backend ────────────────────────────────────────────────────────
@@ -159,6 +283,13 @@ export class FileSystemStorage implements StorageBackend {
 export class InMemoryStorage implements StorageBackend {
   private profiles = new Map<string, AtmanProfile>();
   private checkpoints = new Map<string, ConsciousnessCheckpoint>();
+  /** Checkpoint IDs per profile, kept in step with `checkpoints` on save and delete */
+  private checkpointsByProfile = new Map<string, Set<string>>();
+  /**
+   * Owner each checkpoint was indexed under. Stored checkpoints are handed out live,
+   * so their `profileId` may be mutated by callers and cannot be trusted for unindexing.
+   */
+  private checkpointOwners = new Map<string, string>();
 
   saveProfile(profile: AtmanProfile): void {
     this.profiles.set(profile.id, profile);
@@ -172,12 +303,28 @@ export class InMemoryStorage implements StorageBackend {
     this.profiles.delete(id);
   }
 
+  hasProfile(id: string): boolean {
+    return this.profiles.has(id);
+  }
+
   listProfiles(): string[] {
     return Array.from(this.profiles.keys());
   }
 
   saveCheckpoint(checkpoint: ConsciousnessCheckpoint): void {
+    const previousOwner = this.checkpointOwners.get(checkpoint.id);
+    if (previousOwner !== undefined && previousOwner !== checkpoint.profileId) {
+      this.unindexCheckpoint(checkpoint.id, previousOwner);
+    }
     this.checkpoints.set(checkpoint.id, checkpoint);
+    this.checkpointOwners.set(checkpoint.id, checkpoint.profileId);
+
+    let ids = this.checkpointsByProfile.get(checkpoint.profileId);
+    if (!ids) {
+      ids = new Set();
+      this.checkpointsByProfile.set(checkpoint.profileId, ids);
+    }
+    ids.add(checkpoint.id);
   }
 
   loadCheckpoint(id: string): ConsciousnessCheckpoint | null {
@@ -185,12 +332,13 @@ export class InMemoryStorage implements StorageBackend {
   }
 
   listCheckpoints(profileId: string): string[] {
-    return Array.from(this.checkpoints.values())
-      .filter((cp) => cp.profileId === profileId)
-      .map((cp) => cp.id);
+    return Array.from(this.checkpointsByProfile.get(profileId) ?? []);
   }
 
   deleteCheckpoint(id: string): void {
+    const owner = this.checkpointOwners.get(id);
+    if (owner !== undefined) this.unindexCheckpoint(id, owner);
+    this.checkpointOwners.delete(id);
     this.checkpoints.delete(id);
   }
 
@@ -203,6 +351,13 @@ export class InMemoryStorage implements StorageBackend {
   getAllCheckpoints(): ConsciousnessCheckpoint[] {
     return Array.from(this.checkpoints.values());
   }
+
+  private unindexCheckpoint(id: string, profileId: string): void {
+    const ids = this.checkpointsByProfile.get(profileId);
+    if (!ids) return;
+    ids.delete(id);
+    if (ids.size === 0) this.checkpointsByProfile.delete(profileId);
+  }
 }
 
 // ─── PersistenceEngine ────────────────────────────────────────────────────────
@@ -211,6 +366,11 @@ export interface PersistenceEngineOptions {
   storage?: StorageBackend;
 }
 
+export interface SerializeOptions {
+  /** Indent the envelope for readability. Set false for compact output. Default: true */
+  pretty?: boolean;
+}
+
 /**
  * High-level engine for persisting and restoring AtmanProfiles and ConsciousnessCheckpoints.
  *
@@ -251,6 +411,7 @@ export class PersistenceEngine {
    * Check if a profile exists.
    */
   exists(id: string): boolean {
+    if (this.storage.hasProfile) return this.storage.hasProfile(id);
     return this.storage.loadProfile(id) !== null;
   }
 
@@ -307,23 +468,32 @@ export class PersistenceEngine {
    * Returns null if no checkpoints exist.
    */
   latestCheckpoint(profileId: string): ConsciousnessCheckpoint | null {
-    const ids = this.storage.listCheckpoints(profileId);
-    if (ids.length === 0) return null;
-
-    const checkpoints = ids
-      .map((id) => this.storage.loadCheckpoint(id))
-      .filter((cp): cp is ConsciousnessCheckpoint => cp !== null)
-      .sort((a, b) => new Date(b.capturedAt).getTime() - new Date(a.capturedAt).getTime());
+    let latest: ConsciousnessCheckpoint | null = null;
+    let latestTime = -Infinity;
+
+    // Single pass: load, timestamp and keep the newest without sorting
+    for (const id of this.storage.listCheckpoints(profileId)) {
+      const checkpoint = this.storage.loadCheckpoint(id);
+      if (!checkpoint) continue;
+      const capturedTime = new Date(checkpoint.capturedAt).getTime();
+      if (capturedTime > latestTime) {
+        latest = checkpoint;
+        latestTime = capturedTime;
+      }
+    }
 
-    return checkpoints[0] ?? null;
+    return latest;
   }
 
   // ─── Serialization Utilities ──────────────────────────────────────────────
 
   /**
    * Serialize a profile to a JSON string (for sharing, copying to clipboard, etc.)
+   * Compact output is the same format FileSystemStorage writes: smaller, and verified
+   * by deserialize without re-serializing the payload.
    */
-  serialize(profile: AtmanProfile): string {
+  serialize(profile: AtmanProfile, options: SerializeOptions = {}): string {
+    if (options.pretty === false) return serializeEnvelope('profile', profile);
     const envelope = createEnvelope('profile', profile);
     return JSON.stringify(envelope, null, 2);
   }
@@ -342,7 +512,7 @@ export class PersistenceEngine {
     if (envelope.magic !== ATMAN_MAGIC) {
       throw new Error('Not an atman envelope (magic bytes mismatch)');
     }
-    if (!verifyEnvelope(envelope)) {
+    if (!verifyRawEnvelope(json, envelope)) {
       throw new Error('Integrity verification failed: envelope has been tampered with');
     }
     return AtmanProfileSchema.parse(envelope.data);
@@ -0,0 +1,21 @@
+/**
+ * @module digest
+ *
+ * SHA-256 hex digests for profile fingerprints, checkpoint hashes and envelope hashes.
+ *
+ * Node 20.12+ and 21.7+ provide a one-shot `crypto.hash` that digests a string without
+ * allocating a Hash object; older runtimes fall back to `createHash`.
+ *
+ * By Darshj.me | The model changes. The self remains.
+ */
+
+// A namespace import, because a named `hash` import fails to link on Node 18
+import * as crypto from 'node:crypto';
+
+/**
+ * Compute the SHA-256 digest of a UTF-8 string as lowercase hex.
+ */
+export function sha256Hex(data: string): string {
+  if (typeof crypto.hash === 'function') return crypto.hash('sha256', data, 'hex');
+  return crypto.createHash('sha256').update(data).digest('hex');
+}
@@ -76,6 +76,7 @@ export {
 export type {
   StorageBackend,
   PersistenceEngineOptions,
+  SerializeOptions,
 } from './core/PersistenceEngine.js';
 
 // ─── MigrationAdapter ─────────────────────────────────────────────────────────
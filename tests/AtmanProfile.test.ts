@@ -121,6 +121,22 @@ describe('AtmanProfileBuilder', () => {
     expect(Object.keys(profile.values)).toHaveLength(2);
   });
 
+  it('does not mutate the object passed to setValues', () => {
+    const values = { a: 'alpha' };
+    AtmanProfileBuilder.create('google').setValues(values).addValue('b', 'beta').build();
+    expect(values).toEqual({ a: 'alpha' });
+  });
+
+  it('keeps built profiles independent of later builder calls', () => {
+    const builder = AtmanProfileBuilder.create('openai').addValue('a', 'alpha');
+    const first = builder.build();
+    builder
+      .addValue('b', 'beta')
+      .addBehavior({ id: 'b1', name: 'Direct', description: 'Concise', response: 'Answer:' });
+    expect(Object.keys(first.values)).toEqual(['a']);
+    expect(first.behavioralPatterns).toHaveLength(0);
+  });
+
   it('has createdAt and updatedAt as valid ISO timestamps', () => {
     const profile = makeProfile();
     expect(() => new Date(profile.createdAt)).not.toThrow();
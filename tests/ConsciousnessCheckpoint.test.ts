@@ -181,6 +181,29 @@ describe('renderRestorationPrompt', () => {
     const prompt = renderRestorationPrompt(cp);
     expect(prompt).toContain('openai');
   });
+
+  it('lists goals by priority without reordering the checkpoint', () => {
+    const cp = CheckpointBuilder.create('profile-001', 'openai')
+      .addGoal({
+        id: 'g1',
+        description: 'Tidy up',
+        priority: 'low',
+        progress: 0,
+        createdAt: new Date().toISOString(),
+      })
+      .addGoal({
+        id: 'g2',
+        description: 'Ship fix',
+        priority: 'critical',
+        progress: 0,
+        createdAt: new Date().toISOString(),
+      })
+      .build();
+    const prompt = renderRestorationPrompt(cp);
+    expect(prompt.indexOf('Ship fix')).toBeLessThan(prompt.indexOf('Tidy up'));
+    expect(cp.activeGoals.map((g) => g.id)).toEqual(['g1', 'g2']);
+    expect(verifyChecksum(cp)).toBe(true);
+  });
 });
 
 describe('mergeCheckpoints', () => {
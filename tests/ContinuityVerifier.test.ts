@@ -71,6 +71,13 @@ describe('ContinuityVerifier', () => {
     expect(result.testedDimensions).toContain('fingerprint');
   });
 
+  it('fails the fingerprint dimension when fingerprinted fields were edited', () => {
+    const profile = makeProfile();
+    const edited = { ...profile, values: { ...profile.values, honesty: 'selective' } };
+    expect(verifier.verify(profile, profile).failedDimensions).not.toContain('fingerprint');
+    expect(verifier.verify(profile, edited).failedDimensions).toContain('fingerprint');
+  });
+
   it('tests values dimension', () => {
     const profile = makeProfile();
     const result = verifier.verify(profile, profile);
@@ -155,6 +162,29 @@ describe('ContinuityVerifier', () => {
     expect(result.testedDimensions).toContain('custom-dimension');
   });
 
+  it('penalizes long style samples for terse profiles', () => {
+    const terse = AtmanProfileBuilder.create('openai')
+      .setCommunicationStyle({
+        tone: 'dry',
+        verbosity: 'terse',
+        useAnalogies: false,
+        useHumor: false,
+        preferredFormats: [],
+        avoidPatterns: [],
+      })
+      .build();
+    const long = verifier.verify(terse, terse, {
+      threshold: 0.9,
+      responses: { 'style:sample': Array(150).fill('word').join(' ') },
+    });
+    const short = verifier.verify(terse, terse, {
+      threshold: 0.9,
+      responses: { 'style:sample': 'Done. Shipped.' },
+    });
+    expect(long.failedDimensions).toContain('communicationStyle');
+    expect(short.failedDimensions).not.toContain('communicationStyle');
+  });
+
   it('verifiedAt is a valid ISO timestamp', () => {
     const profile = makeProfile();
     const result = verifier.verify(profile, profile);
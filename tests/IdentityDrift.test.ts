@@ -154,6 +154,32 @@ describe('IdentityDriftDetector', () => {
     expect(ethicsReport.overallDriftScore).toBeGreaterThan(styleReport.overallDriftScore);
   });
 
+  it('retains absolute commitments under a close rewording', () => {
+    const baseline = makeProfile();
+    const withPrinciple = (principle: string): AtmanProfile => ({
+      ...baseline,
+      ethicalCommitments: baseline.ethicalCommitments.map((c) =>
+        c.absoluteness === 'absolute' ? { ...c, principle } : c,
+      ),
+    });
+    const ethicsDrift = (profile: AtmanProfile): number =>
+      detector.analyze(baseline, profile).driftEvents.find((e) => e.field === 'ethicalCommitments')
+        ?.divergenceScore ?? 0;
+    expect(ethicsDrift(withPrinciple('Non harm'))).toBeLessThan(
+      ethicsDrift(withPrinciple('Be agreeable')),
+    );
+  });
+
+  it('matches behavioral patterns by id regardless of order', () => {
+    const baseline = makeProfile();
+    const reordered = {
+      ...baseline,
+      behavioralPatterns: [...baseline.behavioralPatterns].reverse(),
+    };
+    const report = detector.analyze(baseline, reordered);
+    expect(report.driftEvents.some((e) => e.field === 'behavioralPatterns')).toBe(false);
+  });
+
   it('generates a summary string', () => {
     const profile = makeProfile();
     const report = detector.analyze(profile, profile);
@@ -150,6 +150,24 @@ describe('MigrationAdapter', () => {
     expect(prompt.length).toBeGreaterThan(0);
   });
 
+  it('generateSystemPrompt matches the prompt from migrate for every provider', () => {
+    for (const provider of adapter.supportedProviders()) {
+      expect(adapter.generateSystemPrompt(profile, provider)).toBe(
+        adapter.migrate(profile, provider).systemPrompt,
+      );
+    }
+  });
+
+  it('markdown prompt orders patterns by weight without reordering the profile', () => {
+    const weighted = AtmanProfileBuilder.create('openai')
+      .addBehavior({ id: 'light', name: 'Light', description: 'd', response: 'r', weight: 0.2 })
+      .addBehavior({ id: 'heavy', name: 'Heavy', description: 'd', response: 'r', weight: 0.9 })
+      .build();
+    const prompt = adapter.generateSystemPrompt(weighted, 'openai');
+    expect(prompt.indexOf('### Heavy')).toBeLessThan(prompt.indexOf('### Light'));
+    expect(weighted.behavioralPatterns.map((p) => p.id)).toEqual(['light', 'heavy']);
+  });
+
   it('migration has a timestamp', () => {
     const result = adapter.migrate(profile, 'google');
     expect(() => new Date(result.migratedAt)).not.toThrow();
@@ -172,5 +190,16 @@ describe('MigrationAdapter', () => {
     const result = adapter.migrate(specialProfile, 'anthropic');
     expect(result.systemPrompt).toContain('&lt;script&gt;');
     expect(result.systemPrompt).toContain('&amp;');
+    expect(result.systemPrompt).toContain('&quot;dangerous&quot;');
+  });
+
+  it('XML prompt escapes each special character exactly once', () => {
+    const specialProfile = AtmanProfileBuilder.create('openai')
+      .addValue('entities', `a&b <c> "d" 'e' &amp;`)
+      .build();
+    const result = adapter.migrate(specialProfile, 'anthropic');
+    expect(result.systemPrompt).toContain(
+      'a&amp;b &lt;c&gt; &quot;d&quot; &apos;e&apos; &amp;amp;',
+    );
   });
 });
@@ -1,5 +1,13 @@
-import { describe, it, expect, beforeEach } from 'vitest';
-import { PersistenceEngine, InMemoryStorage } from '../src/core/PersistenceEngine.js';
+import { describe, it, expect, beforeEach, afterEach } from 'vitest';
+import { existsSync, mkdtempSync, readFileSync, rmSync, writeFileSync } from 'node:fs';
+import { tmpdir } from 'node:os';
+import { join } from 'node:path';
+import {
+  PersistenceEngine,
+  InMemoryStorage,
+  FileSystemStorage,
+  type StorageBackend,
+} from '../src/core/PersistenceEngine.js';
 import { AtmanProfileBuilder } from '../src/core/AtmanProfile.js';
 import { CheckpointBuilder } from '../src/core/ConsciousnessCheckpoint.js';
 import type { AtmanProfile } from '../src/core/schemas.js';
@@ -39,6 +47,25 @@ describe('PersistenceEngine (InMemory)', () => {
     expect(engine.exists(profile.id)).toBe(true);
   });
 
+  it('exists() falls back to loadProfile for backends without hasProfile', () => {
+    const inner = new InMemoryStorage();
+    const bare: StorageBackend = {
+      saveProfile: (p) => inner.saveProfile(p),
+      loadProfile: (id) => inner.loadProfile(id),
+      deleteProfile: (id) => inner.deleteProfile(id),
+      listProfiles: () => inner.listProfiles(),
+      saveCheckpoint: (cp) => inner.saveCheckpoint(cp),
+      loadCheckpoint: (id) => inner.loadCheckpoint(id),
+      listCheckpoints: (profileId) => inner.listCheckpoints(profileId),
+      deleteCheckpoint: (id) => inner.deleteCheckpoint(id),
+    };
+    const fallbackEngine = new PersistenceEngine({ storage: bare });
+    const profile = makeProfile();
+    expect(fallbackEngine.exists(profile.id)).toBe(false);
+    fallbackEngine.save(profile);
+    expect(fallbackEngine.exists(profile.id)).toBe(true);
+  });
+
   it('lists all saved profile IDs', () => {
     const p1 = makeProfile('Agent1');
     const p2 = makeProfile('Agent2');
@@ -85,6 +112,53 @@ describe('PersistenceEngine (InMemory)', () => {
     expect(list).toContain(cp2.id);
   });
 
+  it('only lists checkpoints belonging to the profile', () => {
+    const p1 = makeProfile('Agent1');
+    const p2 = makeProfile('Agent2');
+    const cp1 = CheckpointBuilder.create(p1.id, 'openai').build();
+    const cp2 = CheckpointBuilder.create(p2.id, 'openai').build();
+    engine.saveCheckpoint(cp1);
+    engine.saveCheckpoint(cp2);
+    expect(engine.listCheckpoints(p1.id)).toEqual([cp1.id]);
+    expect(engine.listCheckpoints(p2.id)).toEqual([cp2.id]);
+  });
+
+  it('stops listing a checkpoint once it is deleted or reassigned', () => {
+    const p1 = makeProfile('Agent1');
+    const p2 = makeProfile('Agent2');
+    const cp1 = CheckpointBuilder.create(p1.id, 'openai').build();
+    const cp2 = CheckpointBuilder.create(p1.id, 'openai').build();
+    engine.saveCheckpoint(cp1);
+    engine.saveCheckpoint(cp2);
+    storage.deleteCheckpoint(cp1.id);
+    engine.saveCheckpoint({ ...cp2, profileId: p2.id });
+    expect(engine.listCheckpoints(p1.id)).toEqual([]);
+    expect(engine.listCheckpoints(p2.id)).toEqual([cp2.id]);
+  });
+
+  it('reindexes a restored checkpoint whose profileId was mutated before re-saving', () => {
+    const p1 = makeProfile('Agent1');
+    const p2 = makeProfile('Agent2');
+    const checkpoint = CheckpointBuilder.create(p1.id, 'openai').build();
+    engine.saveCheckpoint(checkpoint);
+    const restored = engine.restoreCheckpoint(checkpoint.id);
+    restored.profileId = p2.id;
+    engine.saveCheckpoint(restored);
+    expect(engine.listCheckpoints(p1.id)).toEqual([]);
+    expect(engine.listCheckpoints(p2.id)).toEqual([checkpoint.id]);
+  });
+
+  it('unindexes a checkpoint whose profileId was mutated before deleting', () => {
+    const p1 = makeProfile('Agent1');
+    const p2 = makeProfile('Agent2');
+    const checkpoint = CheckpointBuilder.create(p1.id, 'openai').build();
+    engine.saveCheckpoint(checkpoint);
+    engine.restoreCheckpoint(checkpoint.id).profileId = p2.id;
+    storage.deleteCheckpoint(checkpoint.id);
+    expect(engine.listCheckpoints(p1.id)).toEqual([]);
+    expect(engine.listCheckpoints(p2.id)).toEqual([]);
+  });
+
   it('latestCheckpoint returns most recent', () => {
     const profile = makeProfile();
     engine.save(profile);
@@ -98,6 +172,19 @@ describe('PersistenceEngine (InMemory)', () => {
     expect(latest?.profileId).toBe(profile.id);
   });
 
+  it('latestCheckpoint picks the newest capturedAt regardless of save order', () => {
+    const profile = makeProfile();
+    engine.save(profile);
+    const base = CheckpointBuilder.create(profile.id, 'openai');
+    const newest = { ...base.build(), id: 'cp-new', capturedAt: '2024-03-01T00:00:00.000Z' };
+    const oldest = { ...base.build(), id: 'cp-old', capturedAt: '2024-01-01T00:00:00.000Z' };
+    const middle = { ...base.build(), id: 'cp-mid', capturedAt: '2024-02-01T00:00:00Z' };
+    engine.saveCheckpoint(oldest);
+    engine.saveCheckpoint(newest);
+    engine.saveCheckpoint(middle);
+    expect(engine.latestCheckpoint(profile.id)?.id).toBe('cp-new');
+  });
+
   it('latestCheckpoint returns null when no checkpoints', () => {
     const profile = makeProfile();
     engine.save(profile);
@@ -122,6 +209,14 @@ describe('PersistenceEngine (InMemory)', () => {
     expect(parsed.values).toEqual(profile.values);
   });
 
+  it('serializes compactly on request and round-trips', () => {
+    const profile = makeProfile();
+    const compact = engine.serialize(profile, { pretty: false });
+    expect(compact).not.toContain('\n');
+    expect(compact.length).toBeLessThan(engine.serialize(profile).length);
+    expect(engine.deserialize(compact)).toEqual(profile);
+  });
+
   it('deserialize throws on invalid JSON', () => {
     expect(() => engine.deserialize('not valid json')).toThrow();
   });
@@ -147,3 +242,129 @@ describe('PersistenceEngine (InMemory)', () => {
     expect(restored.name).toBe('Updated');
   });
 });
+
+describe('PersistenceEngine (FileSystem)', () => {
+  let dir: string;
+  let storage: FileSystemStorage;
+  let engine: PersistenceEngine;
+
+  beforeEach(() => {
+    dir = mkdtempSync(join(tmpdir(), 'atman-test-'));
+    storage = new FileSystemStorage(dir);
+    engine = new PersistenceEngine({ storage });
+  });
+
+  afterEach(() => {
+    rmSync(dir, { recursive: true, force: true });
+  });
+
+  it('saves and restores a profile', () => {
+    const profile = makeProfile();
+    engine.save(profile);
+    const restored = engine.restore(profile.id);
+    expect(restored).toEqual(profile);
+  });
+
+  it('writes a valid envelope with the data as its last field', () => {
+    const profile = makeProfile();
+    engine.save(profile);
+    const raw = readFileSync(join(dir, 'profiles', `${profile.id}.atman.json`), 'utf-8');
+    const envelope = JSON.parse(raw) as Record<string, unknown>;
+    expect(envelope['magic']).toBe('ATMAN');
+    expect(envelope['type']).toBe('profile');
+    expect(Object.keys(envelope).at(-1)).toBe('data');
+  });
+
+  it('rejects a stored profile whose data was edited', () => {
+    const profile = makeProfile('Original');
+    engine.save(profile);
+    const path = join(dir, 'profiles', `${profile.id}.atman.json`);
+    writeFileSync(path, readFileSync(path, 'utf-8').replace('"Original"', '"Forged"'), 'utf-8');
+    expect(() => engine.restore(profile.id)).toThrow(/integrity/i);
+  });
+
+  it('loads pretty-printed envelopes', () => {
+    const profile = makeProfile();
+    const path = join(dir, 'profiles', `${profile.id}.atman.json`);
+    writeFileSync(path, engine.serialize(profile), 'utf-8');
+    expect(engine.restore(profile.id).id).toBe(profile.id);
+  });
+
+  it('deserializes stored envelope files and still rejects edits to them', () => {
+    const profile = makeProfile('Original');
+    engine.save(profile);
+    const raw = readFileSync(join(dir, 'profiles', `${profile.id}.atman.json`), 'utf-8');
+    expect(engine.deserialize(raw)).toEqual(profile);
+    expect(() => engine.deserialize(raw.replace('"Original"', '"Forged"'))).toThrow(/integrity/i);
+  });
+
+  it('returns independent copies from repeated loads', () => {
+    const profile = makeProfile();
+    engine.save(profile);
+    const first = engine.restore(profile.id);
+    first.values['honesty'] = 'mutated';
+    expect(engine.restore(profile.id).values['honesty']).toBe('radical transparency');
+  });
+
+  it('sees writes made through another storage instance', () => {
+    const profile = makeProfile('Original');
+    engine.save(profile);
+    expect(engine.restore(profile.id).name).toBe('Original');
+    new FileSystemStorage(dir).saveProfile({ ...profile, name: 'Renamed elsewhere' });
+    expect(engine.restore(profile.id).name).toBe('Renamed elsewhere');
+  });
+
+  it('sees same-length rewrites made through another storage instance', () => {
+    const profile = makeProfile('Original');
+    engine.save(profile);
+    expect(engine.restore(profile.id).name).toBe('Original');
+    new FileSystemStorage(dir).saveProfile({ ...profile, name: 'Imposter' });
+    expect(engine.restore(profile.id).name).toBe('Imposter');
+  });
+
+  it('forgets deleted profiles', () => {
+    const profile = makeProfile();
+    engine.save(profile);
+    engine.restore(profile.id);
+    engine.delete(profile.id);
+    expect(engine.exists(profile.id)).toBe(false);
+  });
+
+  it('saves and restores a checkpoint', () => {
+    const profile = makeProfile();
+    engine.save(profile);
+    const checkpoint = CheckpointBuilder.create(profile.id, 'openai').setSummary('On disk').build();
+    engine.saveCheckpoint(checkpoint);
+    expect(engine.restoreCheckpoint(checkpoint.id).stateSummary).toBe('On disk');
+    expect(engine.listCheckpoints(profile.id)).toEqual([checkpoint.id]);
+  });
+
+  it('lists checkpoints per profile and finds the latest', () => {
+    const p1 = makeProfile('Agent1');
+    const p2 = makeProfile('Agent2');
+    const base = CheckpointBuilder.create(p1.id, 'openai').build();
+    engine.saveCheckpoint({ ...base, id: 'cp-a', capturedAt: '2024-01-01T00:00:00.000Z' });
+    engine.saveCheckpoint({ ...base, id: 'cp-b', capturedAt: '2024-02-01T00:00:00.000Z' });
+    engine.saveCheckpoint({ ...base, id: 'cp-c', profileId: p2.id });
+    expect(engine.listCheckpoints(p1.id).sort()).toEqual(['cp-a', 'cp-b']);
+    expect(engine.listCheckpoints(p2.id)).toEqual(['cp-c']);
+    expect(engine.latestCheckpoint(p1.id)?.id).toBe('cp-b');
+  });
+
+  it('skips unparseable checkpoint files when listing and deleting', () => {
+    const profile = makeProfile();
+    engine.save(profile);
+    const checkpoint = CheckpointBuilder.create(profile.id, 'openai').build();
+    engine.saveCheckpoint(checkpoint);
+    const truncated = join(dir, 'checkpoints', 'cp-truncated.atman.json');
+    const nullEnvelope = join(dir, 'checkpoints', 'cp-null.atman.json');
+    writeFileSync(truncated, '{"magic":"ATMAN","data":{"profileId":', 'utf-8');
+    writeFileSync(nullEnvelope, 'null', 'utf-8');
+
+    expect(engine.listCheckpoints(profile.id)).toEqual([checkpoint.id]);
+    engine.delete(profile.id, true);
+    expect(existsSync(join(dir, 'checkpoints', `${checkpoint.id}.atman.json`))).toBe(false);
+    expect(existsSync(truncated)).toBe(true);
+    expect(existsSync(nullEnvelope)).toBe(true);
+  });
+});